@@ -21,6 +21,26 @@ class MyObject():
         cur.execute("SELECT * FROM Table")
         return cur
 ``
+
+A simple thread safe connection pool is also provided:
+
+``
+from dbapi2abc import QueuePool
+
+pool = QueuePool(lambda: sqlite3.connect("app.db"), max_size=10)
+with pool.connection() as db:
+    db.cursor().execute("SELECT 1")
+``
+
+AsyncConnection and AsyncCursor describe asyncio drivers in the same way.
+SyncToAsyncAdapter wraps a blocking connection for use from asyncio code.
 """
 
-from .dbapi2abc import Connection, Cursor
+from .dbapi2abc import (
+    BoundStatement, CachedPrepareMixin, CachingConnectionMixin,
+    ColumnarFetchMixin, CompiledBindMixin, Connection, Cursor,
+    PreparedStatement, capabilities_of, to_pandas
+)
+from .aio import AsyncConnection, AsyncCursor, SyncToAsyncAdapter
+from .binding import bind
+from .pool import ConnectionPool, QueuePool
@@ -0,0 +1,216 @@
+/*
+ * Copyright (C) 2021 Steve Campbell
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *      http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * C implementation of the parameter substitution in dbapi2abc.binding.
+ * Placeholders are located with memchr, which libc vectorizes, rather than
+ * examining the operation one character at a time.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <string.h>
+
+/* Offset of the next c at or after pos, or len if there is none. */
+static Py_ssize_t
+find(const char *buf, Py_ssize_t pos, Py_ssize_t len, char c)
+{
+    const char *p = memchr(buf + pos, c, (size_t)(len - pos));
+    return p ? p - buf : len;
+}
+
+static int
+append(PyObject *out, const char *data, Py_ssize_t size)
+{
+    Py_ssize_t old = PyByteArray_GET_SIZE(out);
+
+    if (size == 0)
+        return 0;
+    if (PyByteArray_Resize(out, old + size) < 0)
+        return -1;
+    memcpy(PyByteArray_AS_STRING(out) + old, data, (size_t)size);
+    return 0;
+}
+
+static int
+append_value(PyObject *out, PyObject *value)
+{
+    if (!PyBytes_Check(value)) {
+        PyErr_Format(PyExc_TypeError,
+                     "quoted parameters must be bytes, not %.200s",
+                     Py_TYPE(value)->tp_name);
+        return -1;
+    }
+    return append(out, PyBytes_AS_STRING(value), PyBytes_GET_SIZE(value));
+}
+
+static PyObject *
+finish(PyObject *out)
+{
+    PyObject *result = PyBytes_FromStringAndSize(
+        PyByteArray_AS_STRING(out), PyByteArray_GET_SIZE(out));
+    Py_DECREF(out);
+    return result;
+}
+
+static PyObject *
+substitute_qmark(PyObject *module, PyObject *args)
+{
+    const char *sql;
+    Py_ssize_t len, pos = 0, start = 0, used = 0, nparams;
+    Py_ssize_t next_qmark, next_squote, next_dquote;
+    PyObject *params, *out;
+
+    if (!PyArg_ParseTuple(args, "y#O!:substitute_qmark",
+                          &sql, &len, &PyTuple_Type, &params))
+        return NULL;
+    nparams = PyTuple_GET_SIZE(params);
+    out = PyByteArray_FromStringAndSize(NULL, 0);
+    if (out == NULL)
+        return NULL;
+
+    next_qmark = find(sql, 0, len, '?');
+    next_squote = find(sql, 0, len, '\'');
+    next_dquote = find(sql, 0, len, '"');
+    while (pos < len) {
+        if (next_qmark < next_squote && next_qmark < next_dquote) {
+            if (used == nparams) {
+                PyErr_SetString(PyExc_ValueError,
+                                "not enough parameters for the operation");
+                goto error;
+            }
+            if (append(out, sql + start, next_qmark - start) < 0 ||
+                append_value(out, PyTuple_GET_ITEM(params, used)) < 0)
+                goto error;
+            used++;
+            pos = start = next_qmark + 1;
+            next_qmark = find(sql, pos, len, '?');
+        }
+        else if (next_squote < len || next_dquote < len) {
+            /* Skip a quoted literal or identifier. A doubled quote inside it
+               is seen as the literal closing and a new one opening. */
+            char quote = next_squote < next_dquote ? '\'' : '"';
+            Py_ssize_t open = quote == '\'' ? next_squote : next_dquote;
+            Py_ssize_t close = find(sql, open + 1, len, quote);
+
+            pos = close < len ? close + 1 : len;
+            if (next_qmark < pos)
+                next_qmark = find(sql, pos, len, '?');
+            if (next_squote < pos)
+                next_squote = find(sql, pos, len, '\'');
+            if (next_dquote < pos)
+                next_dquote = find(sql, pos, len, '"');
+        }
+        else {
+            pos = len;
+        }
+    }
+    if (used != nparams) {
+        PyErr_SetString(PyExc_ValueError,
+                        "too many parameters for the operation");
+        goto error;
+    }
+    if (append(out, sql + start, len - start) < 0)
+        goto error;
+    return finish(out);
+
+error:
+    Py_DECREF(out);
+    return NULL;
+}
+
+static PyObject *
+substitute_pyformat(PyObject *module, PyObject *args)
+{
+    const char *sql;
+    Py_ssize_t len, pos = 0, start = 0;
+    PyObject *params, *out;
+
+    if (!PyArg_ParseTuple(args, "y#O!:substitute_pyformat",
+                          &sql, &len, &PyDict_Type, &params))
+        return NULL;
+    out = PyByteArray_FromStringAndSize(NULL, 0);
+    if (out == NULL)
+        return NULL;
+
+    while ((pos = find(sql, pos, len, '%')) < len) {
+        if (append(out, sql + start, pos - start) < 0)
+            goto error;
+        if (pos + 1 < len && sql[pos + 1] == '%') {
+            if (append(out, "%", 1) < 0)
+                goto error;
+            pos += 2;
+        }
+        else if (pos + 1 < len && sql[pos + 1] == '(') {
+            Py_ssize_t name = pos + 2;
+            Py_ssize_t end = find(sql, name, len, ')');
+            PyObject *key, *value;
+
+            if (end + 1 >= len || sql[end + 1] != 's') {
+                PyErr_SetString(PyExc_ValueError,
+                                "incomplete placeholder in the operation");
+                goto error;
+            }
+            key = PyUnicode_DecodeUTF8(sql + name, end - name, NULL);
+            if (key == NULL)
+                goto error;
+            value = PyDict_GetItemWithError(params, key);
+            if (value == NULL) {
+                if (!PyErr_Occurred())
+                    PyErr_SetObject(PyExc_KeyError, key);
+                Py_DECREF(key);
+                goto error;
+            }
+            Py_DECREF(key);
+            if (append_value(out, value) < 0)
+                goto error;
+            pos = end + 2;
+        }
+        else {
+            PyErr_SetString(PyExc_ValueError,
+                            "unsupported format character in the operation");
+            goto error;
+        }
+        start = pos;
+    }
+    if (append(out, sql + start, len - start) < 0)
+        goto error;
+    return finish(out);
+
+error:
+    Py_DECREF(out);
+    return NULL;
+}
+
+static PyMethodDef bind_methods[] = {
+    {"substitute_qmark", substitute_qmark, METH_VARARGS,
+     "Replace each ? outside quotes with the next quoted parameter."},
+    {"substitute_pyformat", substitute_pyformat, METH_VARARGS,
+     "Replace each %(name)s with the quoted parameter called name."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef bind_module = {
+    PyModuleDef_HEAD_INIT,
+    "dbapi2abc._bind",
+    "C implementation of dbapi2abc.binding parameter substitution.",
+    -1,
+    bind_methods
+};
+
+PyMODINIT_FUNC
+PyInit__bind(void)
+{
+    return PyModule_Create(&bind_module);
+}
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Steve Campbell
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+===
+aio
+===
+
+Asynchronous counterparts of the PEP249 Connection and Cursor interfaces,
+for drivers such as aiomysql or aiosqlite which run queries on an event
+loop rather than blocking a thread per connection.
+
+The methods mirror :mod:`dbapi2abc.dbapi2abc` but are coroutines. See
+there for their full descriptions.
+"""
+__author__ = "Steve Campbell"
+
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    AsyncIterator, Callable, FrozenSet, Optional, Sequence, Union
+)
+
+from .dbapi2abc import Connection, Cursor, _capabilities, capabilities_of
+
+
+class AsyncCursor(ABC):
+    """
+    An asynchronous database cursor.
+
+    Implementations provide the description, rowcount and arraysize
+    attributes described on :class:`~dbapi2abc.Cursor`.
+
+    Rows can be iterated with ``async for row in cur``.
+    """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Close the cursor now.
+        """
+        pass
+
+    @abstractmethod
+    async def execute(
+            self, operation: str, parameters: Union[dict, list, tuple] = ()
+    ):
+        """
+        Prepare and execute a database operation (query or command).
+
+        :param operation: The Query or command to be executed.
+        :param parameters: The values to be bound into the operation.
+        :return: The return type is not defined.
+        """
+        pass
+
+    @abstractmethod
+    async def executemany(
+            self, operation: str, parameters: Sequence[Union[dict, list, tuple]]
+    ):
+        """
+        Prepare a database operation (query or command) and then execute it
+        against all parameter sequences or mappings found in parameters.
+
+        :param operation: The Query or command to be executed.
+        :param parameters: Sequence of sequence or mapping of bind values.
+        :return: The return type is not defined.
+        """
+        pass
+
+    @abstractmethod
+    async def fetchone(self) -> Optional[Sequence]:
+        """
+        Fetch the next row of a query result set, or None when no more data
+        is available.
+
+        :return: Next row of data.
+        """
+        pass
+
+    @abstractmethod
+    async def fetchmany(
+            self, size: Optional[int] = None
+    ) -> Sequence[Sequence]:
+        """
+        Fetch the next set of rows of a query result. An empty sequence is
+        returned when no more rows are available. If size is not given, the
+        cursor's arraysize determines the number of rows to be fetched.
+
+        :param size: Number of rows to fetch.
+        :return: Sequence of rows of data.
+        """
+        pass
+
+    @abstractmethod
+    async def fetchall(self) -> Sequence[Sequence]:
+        """
+        Fetch all (remaining) rows of a query result.
+
+        :return: Sequence of rows of data.
+        """
+        pass
+
+    def __aiter__(self) -> AsyncIterator[Sequence]:
+        return self._iter_rows()
+
+    async def _iter_rows(self) -> AsyncIterator[Sequence]:
+        while True:
+            rows = await self.fetchmany()
+            if not rows:
+                return
+            for row in rows:
+                yield row
+
+
+class AsyncConnection(ABC):
+    """
+    An asynchronous open database connection.
+
+    Support for the optional rollback method can be tested with
+    ``'rollback' in db.capabilities``.
+    """
+
+    _OPTIONAL = ('rollback',)
+
+    _capabilities = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._capabilities = _capabilities(cls, AsyncConnection)
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
+        """
+        The names of the optional methods this connection implements.
+
+        :return: Set of method names.
+        """
+        return self._capabilities
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Close the connection now.
+
+        Closing a connection without committing the changes first will cause
+        an implicit rollback to be performed.
+        :return: None.
+        """
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """
+        Commit any pending transaction to the database.
+        :return: None.
+        """
+        pass
+
+    async def rollback(self) -> None:
+        """
+        Roll back to the start of any pending transaction.
+
+        This method is optional since not all databases provide transaction
+        support.
+        :raise NotImplementedError: If called and it's not supported.
+        :return: None.
+        """
+        raise NotImplementedError(
+            "The database engine does not support rollback!"
+        )
+
+    @abstractmethod
+    async def cursor(self) -> AsyncCursor:
+        """
+        Return a new AsyncCursor Object using the connection.
+        :return: Database cursor.
+        """
+        pass
+
+
+class SyncToAsyncAdapter(AsyncConnection):
+    """
+    Present a blocking :class:`~dbapi2abc.Connection` as an
+    :class:`AsyncConnection`, to ease moving code to asyncio before an
+    asynchronous driver is available.
+
+    Every call on the connection and its cursors runs on one worker thread
+    owned by the adapter, so calls are serialized as they would be on the
+    original connection. Drivers which require a connection to stay on the
+    thread that created it (e.g. sqlite3) should be opened with
+    :meth:`connect`, which runs the factory on that worker thread.
+
+    ``
+    db = await SyncToAsyncAdapter.connect(lambda: sqlite3.connect("app.db"))
+    cur = await db.cursor()
+    await cur.execute("SELECT 1")
+    ``
+    """
+
+    def __init__(self, conn: Connection,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        """
+        :param conn: The blocking connection to wrap.
+        :param executor: Single worker executor to run calls on. It remains
+            owned by the caller and is not shut down by :meth:`close`.
+        """
+        self._conn = conn
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+        self._executor = executor
+
+    @classmethod
+    async def connect(
+            cls, factory: Callable[[], Connection]
+    ) -> "SyncToAsyncAdapter":
+        """
+        Open a connection by calling factory on the adapter's worker thread.
+
+        :param factory: Callable returning a new open connection.
+        :return: The adapted connection.
+        """
+        executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        try:
+            conn = await loop.run_in_executor(executor, factory)
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        adapter = cls(conn, executor)
+        adapter._owns_executor = True
+        return adapter
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def close(self) -> None:
+        try:
+            await self._run(self._conn.close)
+        finally:
+            if self._owns_executor:
+                self._executor.shutdown(wait=False)
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
+        return self._capabilities & capabilities_of(self._conn)
+
+    async def commit(self) -> None:
+        await self._run(self._conn.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self._conn.rollback)
+
+    async def cursor(self) -> AsyncCursor:
+        return _AsyncCursorAdapter(self, await self._run(self._conn.cursor))
+
+
+class _AsyncCursorAdapter(AsyncCursor):
+    """ AsyncCursor returned by :meth:`SyncToAsyncAdapter.cursor`. """
+
+    def __init__(self, conn: SyncToAsyncAdapter, cur: Cursor):
+        self._conn = conn
+        self._cur = cur
+
+    @property
+    def description(self) -> Optional[Sequence]:
+        return self._cur.description
+
+    @property
+    def rowcount(self) -> Optional[int]:
+        return self._cur.rowcount
+
+    @property
+    def arraysize(self) -> int:
+        return self._cur.arraysize
+
+    @arraysize.setter
+    def arraysize(self, size: int):
+        self._cur.arraysize = size
+
+    async def close(self) -> None:
+        await self._conn._run(self._cur.close)
+
+    async def execute(
+            self, operation: str, parameters: Union[dict, list, tuple] = ()
+    ):
+        await self._conn._run(self._cur.execute, operation, parameters)
+
+    async def executemany(
+            self, operation: str, parameters: Sequence[Union[dict, list, tuple]]
+    ):
+        await self._conn._run(self._cur.executemany, operation, parameters)
+
+    async def fetchone(self) -> Optional[Sequence]:
+        return await self._conn._run(self._cur.fetchone)
+
+    async def fetchmany(
+            self, size: Optional[int] = None
+    ) -> Sequence[Sequence]:
+        if size is None:
+            size = self._cur.arraysize
+        return await self._conn._run(self._cur.fetchmany, size)
+
+    async def fetchall(self) -> Sequence[Sequence]:
+        return await self._conn._run(self._cur.fetchall)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Steve Campbell
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+=======
+binding
+=======
+
+Client side parameter substitution for drivers implementing
+:meth:`Cursor.execute` on top of a protocol without bind parameters.
+
+The placeholder scan is done by the optional ``dbapi2abc._bind`` C
+extension when it was built, and in pure Python otherwise. The published
+wheel is pure Python; build from source with ``DBAPI2ABC_BUILD_EXT=1`` set
+to compile the extension.
+
+Values are quoted as standard SQL literals, with quotes doubled and
+backslashes left alone. This is only safe for servers which treat
+backslashes in string literals literally, such as SQLite or PostgreSQL with
+standard_conforming_strings; MySQL in its default mode is not one of them.
+"""
+__author__ = "Steve Campbell"
+
+import datetime
+import decimal
+import math
+import re
+from typing import Mapping, Sequence, Union
+
+try:
+    from ._bind import substitute_pyformat, substitute_qmark
+except ImportError:  # pragma: no cover - depends on the build
+    substitute_pyformat = substitute_qmark = None
+
+_QMARK = re.compile(rb"'[^']*'?|\"[^\"]*\"?|\?")
+_PYFORMAT = re.compile(rb"%(?:\(([^)]*)\)s|(%))?")
+
+
+def quote(value) -> bytes:
+    """
+    Render value as an SQL literal.
+
+    :param value: None, bool, int, float, Decimal, str, bytes or a
+        date, time or datetime.
+    :raise TypeError: If the type of value is not supported.
+    :raise ValueError: If value is an infinite or NaN number.
+    :return: The literal, UTF-8 encoded.
+    """
+    if value is None:
+        return b"NULL"
+    if isinstance(value, bool):
+        return b"TRUE" if value else b"FALSE"
+    # Use the base class methods so subclasses (e.g. IntEnum members) with
+    # their own __str__ or __repr__ cannot inject arbitrary text.
+    if isinstance(value, int):
+        return int.__repr__(value).encode("ascii")
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError("Cannot quote {!r}".format(value))
+        return float.__repr__(value).encode("ascii")
+    if isinstance(value, decimal.Decimal):
+        if not value.is_finite():
+            raise ValueError("Cannot quote {!r}".format(value))
+        return decimal.Decimal.__str__(value).encode("ascii")
+    if isinstance(value, str):
+        return b"'" + value.replace("'", "''").encode("utf-8") + b"'"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return b"X'" + bytes(value).hex().encode("ascii") + b"'"
+    if isinstance(value, (datetime.date, datetime.time)):
+        return b"'" + value.isoformat().encode("ascii") + b"'"
+    raise TypeError("Cannot quote {}".format(type(value).__name__))
+
+
+def _substitute_qmark(sql: bytes, params: tuple) -> bytes:
+    """ Pure Python version of ``_bind.substitute_qmark``. """
+    values = iter(params)
+
+    def replace(match):
+        if match.group() != b"?":
+            return match.group()
+        try:
+            return next(values)
+        except StopIteration:
+            raise ValueError("not enough parameters for the operation")
+
+    result = _QMARK.sub(replace, sql)
+    if next(values, None) is not None:
+        raise ValueError("too many parameters for the operation")
+    return result
+
+
+def _substitute_pyformat(sql: bytes, params: dict) -> bytes:
+    """ Pure Python version of ``_bind.substitute_pyformat``. """
+
+    def replace(match):
+        name, percent = match.groups()
+        if percent is not None:
+            return b"%"
+        if name is None:
+            raise ValueError(
+                "unsupported format character in the operation"
+            )
+        return params[name.decode("utf-8")]
+
+    return _PYFORMAT.sub(replace, sql)
+
+
+if substitute_qmark is None:
+    substitute_qmark = _substitute_qmark
+    substitute_pyformat = _substitute_pyformat
+
+
+def bind(
+        sql: Union[str, bytes],
+        params: Union[Mapping, Sequence],
+        paramstyle: str = "qmark"
+) -> bytes:
+    """
+    Substitute quoted params into the placeholders of sql.
+
+    For the qmark paramstyle each ``?`` outside quoted literals and
+    identifiers is replaced by the next item of params. For pyformat each
+    ``%(name)s`` is replaced by ``params[name]`` and ``%%`` by ``%``.
+
+    :param sql: The Query or command, str is UTF-8 encoded.
+    :param params: Sequence (qmark) or mapping (pyformat) of bind values.
+    :param paramstyle: 'qmark' or 'pyformat'.
+    :raise ValueError: If the placeholders and params do not match.
+    :return: The operation with the literals substituted, UTF-8 encoded.
+    """
+    if isinstance(sql, str):
+        sql = sql.encode("utf-8")
+    if paramstyle == "qmark":
+        return substitute_qmark(sql, tuple(quote(value) for value in params))
+    if paramstyle == "pyformat":
+        return substitute_pyformat(
+            sql, {name: quote(value) for name, value in params.items()}
+        )
+    raise ValueError("Unsupported paramstyle {!r}".format(paramstyle))
@@ -28,14 +28,233 @@ See `PEP249
 """
 __author__ = "Steve Campbell"
 
+import array
+import inspect
 from abc import ABC, abstractmethod
-from typing import Optional, Sequence, Union
+from collections import OrderedDict
+from itertools import islice
+from typing import (
+    Any, Callable, FrozenSet, Hashable, Iterator, Optional, Sequence, Union
+)
 
 # NOTE: Don't abstract exceptions. Because the real exceptions won't inherit
 # from them and hence will not be caught by except statements.
 
 # Descriptions taken from https://www.python.org/dev/peps/pep-0249/
 
+# Default number of entries kept by the statement/plan caches. Matches the
+# statement_cache_size default used by common drivers such as asyncpg.
+DEFAULT_CACHE_SIZE = 500
+
+
+class _LRUCache:
+    """ Minimal least-recently-used mapping used by the caching mixins. """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, on_evict=None):
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self._on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, size: int):
+        self._maxsize = max(0, size)
+        self._trim()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self._maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._trim()
+
+    def clear(self) -> None:
+        while self._data:
+            self._evict()
+
+    def _trim(self) -> None:
+        while len(self._data) > self._maxsize:
+            self._evict()
+
+    def _evict(self) -> None:
+        _key, value = self._data.popitem(last=False)
+        if self._on_evict is not None:
+            self._on_evict(value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _has_methods(cls: type, names: Sequence[str]) -> bool:
+    """
+    Return True if cls has a plain (not coroutine) method for every name, as
+    used by the ``__subclasshook__`` of :class:`Cursor` and
+    :class:`Connection`.
+    """
+    for name in names:
+        method = getattr(cls, name, None)
+        if not callable(method) or inspect.iscoroutinefunction(method):
+            return False
+    return True
+
+
+def _capabilities(cls: type, base: type) -> frozenset:
+    """
+    Return the names in base._OPTIONAL which cls implements, i.e. where the
+    method cls resolves to is not the base's.
+    """
+    found = set()
+    for name in base._OPTIONAL:
+        for klass in cls.__mro__:
+            method = vars(klass).get(name)
+            if method is None:
+                continue
+            if klass is not base:
+                found.add(name)
+            break
+    return frozenset(found)
+
+
+# Optional methods defined by PEP249 itself, as opposed to the extensions
+# added by this package, which a driver cursor may provide.
+_PEP249_CURSOR_OPTIONAL = (
+    'callproc', 'nextset', 'setinputsizes', 'setoutputsize',
+)
+
+
+def capabilities_of(obj) -> FrozenSet[str]:
+    """
+    Return the capabilities of a :class:`Cursor` or :class:`Connection`,
+    including virtual subclasses such as sqlite3 objects which have no
+    capabilities attribute. For those, the optional PEP249 methods the
+    object has are reported, but never the extensions of this package.
+
+    :param obj: Cursor or connection.
+    :return: Set of method names.
+    """
+    caps = getattr(obj, 'capabilities', None)
+    if caps is not None:
+        return caps
+    if isinstance(obj, Connection):
+        optional = Connection._OPTIONAL
+    elif isinstance(obj, Cursor):
+        optional = _PEP249_CURSOR_OPTIONAL
+    else:
+        return frozenset()
+    return frozenset(
+        name for name in optional if callable(getattr(obj, name, None))
+    )
+
+
+def _missing_cursor_attribute(self, name: str):
+    """
+    ``__getattr__`` installed on :class:`Cursor` subclasses which set
+    debug_attributes, naming the required attribute that was not set. Names
+    the class defines a descriptor for, e.g. a property which itself raised
+    AttributeError, get the normal error.
+    """
+    cls = type(self)
+    if (name in Cursor._REQUIRED_ATTRS
+            and not any(name in vars(klass) for klass in cls.__mro__)):
+        raise AttributeError(
+            "{} must set the '{}' attribute in __init__".format(
+                cls.__name__, name
+            )
+        )
+    raise AttributeError(
+        "'{}' object has no attribute '{}'".format(cls.__name__, name)
+    )
+
+
+class PreparedStatement(ABC):
+    """
+    A handle on an operation which has been parsed and planned once by the
+    database and can then be executed many times with different parameters.
+
+    Instances are returned by :meth:`Cursor.prepare`.
+    """
+
+    @property
+    @abstractmethod
+    def sql(self) -> str:
+        """
+        The operation this statement was prepared from.
+        """
+        pass
+
+    @abstractmethod
+    def execute(self, parameters: Union[dict, list, tuple]):
+        """
+        Execute the prepared operation with the given bind values.
+
+        :param parameters: The values to be bound into the operation.
+        :return: The return type is not defined.
+        """
+        pass
+
+    @abstractmethod
+    def executemany(self, parameters: Sequence[Union[dict, list, tuple]]):
+        """
+        Execute the prepared operation against all parameter sequences or
+        mappings found in parameters.
+
+        :param parameters: Sequence of sequence or mapping of bind values.
+        :return: The return type is not defined.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Release the server side resources held by the statement.
+
+        The statement will be unusable from this point forward.
+        """
+        pass
+
+
+class BoundStatement:
+    """
+    An operation together with a binder specialised for a fixed shape of
+    parameters. Calling the statement only converts the values, the
+    operation text is not parsed again.
+
+    Instances are returned by :meth:`Cursor.compile`.
+    """
+
+    def __init__(self, sql: str, binder: Callable[[Sequence], Sequence]):
+        """
+        :param sql: The operation the statement was compiled from.
+        :param binder: Callable converting a sequence of values.
+        """
+        self.sql = sql
+        self._binder = binder
+
+    def __call__(self, values: Sequence) -> Sequence:
+        """
+        Convert values ready to be sent with the operation.
+
+        :param values: Sequence of bind values, one per parameter.
+        :return: The converted values.
+        """
+        return self._binder(values)
+
+
 class Cursor(ABC):
     """
     These objects represent a database cursor, which is used to manage the
@@ -45,12 +264,11 @@ class Cursor(ABC):
     connections can or can not be isolated, depending on how the transaction
     support is implemented (see :meth:`Connection.rollback` and
     :meth:`Connection.commit`).
-    """
 
-    @property
-    @abstractmethod
-    def description(self) -> Optional[Sequence]:
-        """
+    Implementations must set the following attributes, normally in
+    ``__init__``:
+
+    description
         This read-only attribute is a sequence of 7-item sequences.
 
         Each of these sequences contains information describing one result
@@ -72,13 +290,8 @@ class Cursor(ABC):
         if the cursor has not had an operation invoked via the
         :meth:`Cursor.execute`
         method yet.
-        """
-        pass
 
-    @property
-    @abstractmethod
-    def rowcount(self) -> Optional[int]:
-        """
+    rowcount
         This read-only attribute specifies the number of rows that the last
         :meth:`Cursor.execute`
         produced (for DQL statements like SELECT) or affected (for
@@ -93,9 +306,79 @@ class Cursor(ABC):
         specification could redefine the latter case to have the object
         return None instead of -1.
 
-        :return: The number of rows found or affected.
+    arraysize
+        This read/write attribute specifies the number of rows to fetch at a
+        time with
+        :meth:`~dbapi.Cursor.fetchmany`
+        It defaults to 1 meaning to fetch a single row at a time.
+
+        Implementations must observe this value with respect to the
+        :meth:`~dbapi.Cursor.fetchmany`
+        method, but are free to interact with the database a single row at a
+        time. It may also be used in the implementation of
+        :meth:`~dbapi.Cursor.executemany`.
+
+    Implementations may instead define them as properties.
+
+    The optional methods raise NotImplementedError when the database does not
+    support them. Rather than catching that, callers can test for support
+    with ``name in cur.capabilities``.
+
+    Any class providing the mandatory PEP249 cursor methods, such as
+    ``sqlite3.Cursor``, is treated as a virtual subclass by isinstance() and
+    issubclass(). The check runs once per class; ABCMeta caches the result.
+    Virtual subclasses only guarantee the PEP249 methods: they lack
+    capabilities, iter_rows, iteration in arraysize batches and the
+    execute_batch fallback of executemany. Use :func:`capabilities_of` to
+    test any cursor for optional methods.
+    """
+
+    # Plain attributes rather than properties: they are read in tight fetch
+    # loops, and an instance attribute avoids a descriptor call on every
+    # access. Empty slots keep the class compatible with C implemented
+    # driver cursors as a second base.
+    __slots__ = ()
+
+    _REQUIRED_ATTRS = ('description', 'rowcount', 'arraysize')
+
+    #: Set to True on a subclass while developing it to get a clear error
+    #: when description, rowcount or arraysize was never set.
+    debug_attributes = False
+
+    _OPTIONAL = (
+        'callproc', 'compile', 'execute_batch', 'fetch_arrow', 'nextset',
+        'prepare', 'setinputsizes', 'setoutputsize',
+    )
+
+    _capabilities = frozenset()
+
+    _METHODS = (
+        'close', 'execute', 'executemany', 'fetchall', 'fetchmany',
+        'fetchone',
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._capabilities = _capabilities(cls, Cursor)
+        if cls.debug_attributes and '__getattr__' not in vars(cls):
+            cls.__getattr__ = _missing_cursor_attribute
+
+    @classmethod
+    def __subclasshook__(cls, C):
+        if cls is Cursor and _has_methods(C, Cursor._METHODS):
+            return True
+        return NotImplemented
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
         """
-        pass
+        The names of the optional methods this cursor implements, computed
+        once per class. Testing membership here is cheaper than calling the
+        method and catching NotImplementedError.
+
+        :return: Set of method names.
+        """
+        return self._capabilities
 
     def callproc(self, procname: str, args: Union[list, tuple]):
         """
@@ -166,7 +449,10 @@ class Cursor(ABC):
         """
         pass
 
-    @abstractmethod
+    #: Number of parameter sets passed to each :meth:`execute_batch` call by
+    #: the default :meth:`executemany`.
+    executemany_page_size = 100
+
     def executemany(
             self, operation: str, parameters: Sequence[Union[dict, list, tuple]]
     ):
@@ -187,11 +473,82 @@ class Cursor(ABC):
         The same comments as for :meth:`~dbapi.Cursor.execute` also apply
         accordingly to this method.
 
+        The default implementation splits parameters into pages of
+        :attr:`executemany_page_size` and passes each page to
+        :meth:`~dbapi.Cursor.execute_batch`, so that a backend can send many
+        parameter sets per round trip. If the backend does not implement
+        batching, or execute_batch raises NotImplementedError for the
+        operation, it calls :meth:`~dbapi.Cursor.execute` once per parameter
+        set instead.
+
+        NOTE: When batching, :attr:`rowcount` is backend defined and may only
+        reflect the last page rather than the whole operation.
+
         :param operation: The Query or command to be executed.
         :param parameters: Sequence of sequence or mapping of bind values.
         :return: The return type is not defined.
         """
-        pass
+        # Skip the attempt entirely for backends without batching, but still
+        # fall back if execute_batch declines this particular operation.
+        batched = 'execute_batch' in self.capabilities
+        page_size = self.executemany_page_size
+        it = iter(parameters)
+        while True:
+            page = list(islice(it, page_size))
+            if not page:
+                break
+            if batched:
+                try:
+                    self.execute_batch(operation, page, page_size)
+                    continue
+                except NotImplementedError:
+                    batched = False
+            for params in page:
+                self.execute(operation, params)
+
+    def execute_batch(
+            self, operation: str,
+            parameters: Sequence[Union[dict, list, tuple]],
+            page_size: int = 100
+    ):
+        """
+        Execute a database operation against a page of parameter sequences
+        or mappings using as few round trips to the database as possible,
+        e.g. by sending several statements or a multi-row VALUES list at once.
+
+        This is used by the default :meth:`~dbapi.Cursor.executemany`.
+
+        This method is optional since not all databases support batching.
+
+        :param operation: The Query or command to be executed.
+        :param parameters: Sequence of sequence or mapping of bind values.
+        :param page_size: Maximum number of parameter sets per round trip.
+        :raise NotImplementedError: If called and it's not supported.
+        :return: The return type is not defined.
+        """
+        raise NotImplementedError(
+            "The database engine does not support execute_batch!"
+        )
+
+    def prepare(self, operation: str) -> PreparedStatement:
+        """
+        Prepare a database operation (query or command) for repeated
+        execution, returning a :class:`PreparedStatement`.
+
+        The database parses and plans the operation once; each subsequent
+        :meth:`PreparedStatement.execute` only sends the bind values.
+
+        This method is optional and not part of PEP249, see
+        :class:`CachedPrepareMixin` for a default built on top of a driver's
+        own prepare support.
+
+        :param operation: The Query or command to be prepared.
+        :raise NotImplementedError: If called and it's not supported.
+        :return: A prepared statement handle.
+        """
+        raise NotImplementedError(
+            "The database engine does not support prepare!"
+        )
 
     @abstractmethod
     def fetchone(self) -> Optional[Sequence]:
@@ -235,6 +592,27 @@ class Cursor(ABC):
         """
         pass
 
+    def fetch_arrow(self, size: Optional[int] = None):
+        """
+        Fetch the next set of rows of a query result as a
+        ``pyarrow.Table``, with one column per entry of
+        :attr:`description`. If size is None all remaining rows are fetched.
+
+        Columnar results avoid creating a Python object per value, which
+        dominates the cost of fetching large result sets with
+        :meth:`~dbapi.Cursor.fetchall`.
+
+        This method is optional and not part of PEP249, see
+        :class:`ColumnarFetchMixin` for a default implementation.
+
+        :param size: Number of rows to fetch.
+        :raise NotImplementedError: If called and it's not supported.
+        :return: pyarrow.Table of rows.
+        """
+        raise NotImplementedError(
+            "The database engine does not support fetch_arrow!"
+        )
+
     @abstractmethod
     def fetchall(self) -> Sequence[Sequence]:
         """
@@ -250,6 +628,34 @@ class Cursor(ABC):
         :return: Sequence of rows of data.
         """
 
+    def iter_rows(self, batch_size: Optional[int] = None) -> Iterator[Sequence]:
+        """
+        Iterate over the remaining rows of a query result, fetching them
+        batch_size rows at a time with :meth:`~dbapi.Cursor.fetchmany`, so
+        that only one batch is held in memory rather than the whole result
+        as with :meth:`~dbapi.Cursor.fetchall`.
+
+        Combined with a server side cursor (e.g. a psycopg2 named cursor)
+        the rows are also streamed from the database rather than all
+        transferred by :meth:`~dbapi.Cursor.execute`.
+
+        :param batch_size: Rows per fetch, defaults to the cursor's arraysize.
+        :return: Iterator over rows of data.
+        """
+        size = batch_size or self.arraysize or 1000
+        while True:
+            rows = self.fetchmany(size)
+            if not rows:
+                return
+            yield from rows
+
+    def __iter__(self) -> Iterator[Sequence]:
+        """
+        Iterate over the remaining rows of a query result, see
+        :meth:`~dbapi.Cursor.iter_rows`.
+        """
+        return self.iter_rows()
+
     def nextset(self) -> Optional[bool]:
         """
         This method will make the cursor skip to the next available set,
@@ -274,29 +680,29 @@ class Cursor(ABC):
             "The database engine does not support nextset!"
         )
 
-    @property
-    @abstractmethod
-    def arraysize(self) -> int:
+    def compile(
+            self, operation: str, param_types: Optional[Sequence] = None
+    ) -> BoundStatement:
         """
-        This read/write attribute specifies the number of rows to fetch at a
-        time with
-        :meth:`~dbapi.Cursor.fetchmany`
-        It defaults to 1 meaning to fetch a single row at a time.
+        Compile a database operation for repeated execution with parameters
+        of a fixed shape, returning a :class:`BoundStatement` which only
+        marshals values on each call.
 
-        Implementations must observe this value with respect to the
-        :meth:`~dbapi.Cursor.fetchmany`
-        method, but are free to interact with the database a single row at a
-        time. It may also be used in the implementation of
-        :meth:`~dbapi.Cursor.executemany`.
+        param_types follows the format of
+        :meth:`~dbapi.Cursor.setinputsizes`; if it is not given the sizes
+        last passed to that method are used.
 
-        :return: The number of rows to fetch.
-        """
-        pass
+        This method is optional and not part of PEP249, see
+        :class:`CompiledBindMixin` for a default implementation.
 
-    @arraysize.setter
-    @abstractmethod
-    def arraysize(self, size: int):
-        pass
+        :param operation: The Query or command to be compiled.
+        :param param_types: Sequence of Types or integer sizes.
+        :raise NotImplementedError: If called and it's not supported.
+        :return: A bound statement.
+        """
+        raise NotImplementedError(
+            "The database engine does not support compile!"
+        )
 
     def setinputsizes(self, sizes: Sequence) -> None:
         """
@@ -341,7 +747,44 @@ class Cursor(ABC):
 
 
 class Connection(ABC):
-    """ A Connection object represents an open database connection. """
+    """
+    A Connection object represents an open database connection.
+
+    Support for the optional rollback method can be tested with
+    ``'rollback' in db.capabilities``.
+
+    Any class providing the mandatory PEP249 connection methods, such as
+    ``sqlite3.Connection``, is treated as a virtual subclass by isinstance()
+    and issubclass(). The check runs once per class; ABCMeta caches the
+    result. Virtual subclasses only guarantee the PEP249 methods, e.g. they
+    have no capabilities attribute; use :func:`capabilities_of` instead.
+    """
+
+    _OPTIONAL = ('rollback',)
+
+    _capabilities = frozenset()
+
+    _METHODS = ('close', 'commit', 'cursor')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._capabilities = _capabilities(cls, Connection)
+
+    @classmethod
+    def __subclasshook__(cls, C):
+        if cls is Connection and _has_methods(C, Connection._METHODS):
+            return True
+        return NotImplemented
+
+    @property
+    def capabilities(self) -> FrozenSet[str]:
+        """
+        The names of the optional methods this connection implements,
+        computed once per class.
+
+        :return: Set of method names.
+        """
+        return self._capabilities
 
     @abstractmethod
     def close(self) -> None:
@@ -399,3 +842,458 @@ class Connection(ABC):
         :return: Database cursor.
         """
         pass
+
+    @property
+    def plan_cache_size(self) -> int:
+        """
+        The maximum number of query plans the connection caches for reuse
+        by its cursors. This is not part of PEP249; connections without a
+        plan cache report 0. See :class:`CachingConnectionMixin`.
+
+        :return: The maximum number of cached plans.
+        """
+        return 0
+
+    def invalidate_plan_cache(self) -> None:
+        """
+        Discard all cached query plans, e.g. after the schema has changed.
+
+        Connections without a plan cache do nothing.
+        :return: None.
+        """
+        pass
+
+
+class CachedPrepareMixin:
+    """
+    Mixin for :class:`Cursor` implementations which keeps an LRU cache of
+    :class:`PreparedStatement` objects keyed on the operation text, so that
+    repeated operations skip the parse and plan step on the server.
+
+    Implementations provide :meth:`_prepare` to create a new statement;
+    :meth:`prepare` and :meth:`execute` are supplied by the mixin. Call
+    :meth:`clear_statement_cache` from the cursor's ``close()``.
+
+    ``
+    class MyCursor(CachedPrepareMixin, Cursor):
+        def _prepare(self, operation: str) -> PreparedStatement:
+            ...
+
+        def close(self) -> None:
+            self.clear_statement_cache()
+            ...
+    ``
+
+    Set :attr:`statement_cache_size` to 0 to disable caching, e.g. when
+    connecting through a transaction pooler such as pgBouncer which does not
+    preserve prepared statements between transactions.
+    """
+
+    _statement_cache = None
+    _uncached_statement = None
+    _current_statement = None
+
+    @property
+    def _statements(self) -> _LRUCache:
+        if self._statement_cache is None:
+            self._statement_cache = _LRUCache(
+                DEFAULT_CACHE_SIZE, on_evict=self._evict_statement
+            )
+        return self._statement_cache
+
+    @property
+    def statement_cache_size(self) -> int:
+        """
+        This read/write attribute specifies the maximum number of prepared
+        statements kept by the cursor. Statements evicted from the cache are
+        closed, except the :attr:`current_statement` which stays open until
+        the next :meth:`execute`. It defaults to 500; 0 disables caching.
+
+        :return: The maximum number of cached statements.
+        """
+        return self._statements.maxsize
+
+    @statement_cache_size.setter
+    def statement_cache_size(self, size: int):
+        self._statements.maxsize = size
+
+    def _prepare(self, operation: str) -> PreparedStatement:
+        """
+        Create a new prepared statement for operation. Must be implemented
+        by the cursor.
+
+        :param operation: The Query or command to be prepared.
+        :return: A prepared statement handle.
+        """
+        raise NotImplementedError(
+            "The cursor does not implement _prepare!"
+        )
+
+    def prepare(self, operation: str) -> PreparedStatement:
+        """
+        Return the cached statement for operation, preparing it on a miss.
+
+        When caching is disabled the caller owns the returned statement and
+        is responsible for closing it.
+        """
+        statement = self._statements.get(operation)
+        if statement is None:
+            statement = self._prepare(operation)
+            self._statements.put(operation, statement)
+        return statement
+
+    @property
+    def current_statement(self) -> Optional[PreparedStatement]:
+        """
+        The statement run by the last :meth:`execute`, which holds any
+        pending result set for the cursor's fetch methods, or None.
+
+        :return: The prepared statement.
+        """
+        return self._current_statement
+
+    def execute(self, operation: str, parameters: Union[dict, list, tuple]):
+        if self.statement_cache_size:
+            statement = self.prepare(operation)
+            self._close_uncached_statement()
+        else:
+            # Caching disabled: keep the statement alive only until the next
+            # operation, so any result set can still be fetched.
+            self._close_uncached_statement()
+            statement = self._uncached_statement = self._prepare(operation)
+        self._current_statement = statement
+        return statement.execute(parameters)
+
+    def clear_statement_cache(self) -> None:
+        """
+        Close and discard all prepared statements held by the cursor.
+        """
+        self._current_statement = None
+        self._close_uncached_statement()
+        self._statements.clear()
+
+    def _evict_statement(self, statement: PreparedStatement) -> None:
+        if statement is self._current_statement:
+            # Its result set may still be being fetched, so close it on the
+            # next execute rather than now.
+            self._close_uncached_statement()
+            self._uncached_statement = statement
+        else:
+            statement.close()
+
+    def _close_uncached_statement(self) -> None:
+        if self._uncached_statement is not None:
+            self._uncached_statement.close()
+            self._uncached_statement = None
+
+
+# Leading keywords of operations which change the schema and hence may make
+# cached plans stale.
+_DDL_KEYWORDS = frozenset(("ALTER", "CREATE", "DROP", "RENAME", "TRUNCATE"))
+
+
+class CachingConnectionMixin:
+    """
+    Mixin for :class:`Connection` implementations which keeps an LRU cache
+    of query plans keyed on the parameterized operation text, shared by all
+    cursors of the connection. Operations differing only in their bound
+    values share a plan.
+
+    Cursors consult :meth:`get_plan` before parsing an operation, store the
+    result with :meth:`put_plan`, and pass every executed operation to
+    :meth:`note_operation`. If a schema change was seen the cache is
+    invalidated when the transaction ends, so implementations must call
+    :meth:`_end_transaction` from their ``commit()`` and ``rollback()``.
+
+    ``
+    class MyConnection(CachingConnectionMixin, Connection):
+        def commit(self) -> None:
+            self._db.commit()
+            self._end_transaction()
+    ``
+    """
+
+    _plan_cache = None
+    _ddl_seen = False
+
+    @property
+    def _plans(self) -> _LRUCache:
+        if self._plan_cache is None:
+            self._plan_cache = _LRUCache(DEFAULT_CACHE_SIZE)
+        return self._plan_cache
+
+    @property
+    def plan_cache_size(self) -> int:
+        """
+        This read/write attribute specifies the maximum number of query
+        plans kept by the connection. It defaults to 500; 0 disables caching.
+
+        :return: The maximum number of cached plans.
+        """
+        return self._plans.maxsize
+
+    @plan_cache_size.setter
+    def plan_cache_size(self, size: int):
+        self._plans.maxsize = size
+
+    def get_plan(self, operation: str) -> Optional[Any]:
+        """
+        Return the cached plan for operation, or None on a miss.
+
+        :param operation: The parameterized Query or command.
+        :return: The cached plan.
+        """
+        return self._plans.get(operation)
+
+    def put_plan(self, operation: str, plan: Any) -> None:
+        """
+        Cache the plan for operation, evicting the least recently used plan
+        if the cache is full.
+
+        :param operation: The parameterized Query or command.
+        :param plan: The driver specific plan object.
+        """
+        self._plans.put(operation, plan)
+
+    def note_operation(self, operation: str) -> None:
+        """
+        Record that operation is being executed, so that schema changes can
+        invalidate the cache at the end of the transaction.
+
+        :param operation: The Query or command being executed.
+        """
+        words = operation.split(None, 1)
+        if words and words[0].upper() in _DDL_KEYWORDS:
+            self._ddl_seen = True
+
+    def invalidate_plan_cache(self) -> None:
+        self._plans.clear()
+        self._ddl_seen = False
+
+    def cache_stats(self) -> dict:
+        """
+        Return plan cache statistics.
+
+        :return: Dict of size, hits, misses and hit_rate.
+        """
+        plans = self._plans
+        lookups = plans.hits + plans.misses
+        return {
+            "size": len(plans),
+            "hits": plans.hits,
+            "misses": plans.misses,
+            "hit_rate": plans.hits / lookups if lookups else 0.0,
+        }
+
+    def _end_transaction(self) -> None:
+        """
+        Invalidate the plan cache if a schema change was seen during the
+        transaction. Must be called by the connection's ``commit()`` and
+        ``rollback()``.
+        """
+        if self._ddl_seen:
+            self.invalidate_plan_cache()
+
+
+def _make_binder(param_types: Sequence) -> Callable[[Sequence], tuple]:
+    """
+    Generate a function converting a fixed number of values with the
+    converters in param_types, e.g. for ``(int, None)``::
+
+        def _bind(v):
+            v0, v1 = v
+            return (_cvt0(v0), v1)
+
+    Classes such as int or str are used as converters. Anything else, i.e.
+    None, integer sizes and driver Type Objects (which may be callables
+    with other signatures), passes the value through unchanged.
+    """
+    namespace = {}
+    names = ["v{}".format(i) for i in range(len(param_types))]
+    values = []
+    for i, param_type in enumerate(param_types):
+        if isinstance(param_type, type):
+            namespace["_cvt{}".format(i)] = param_type
+            values.append("_cvt{}({})".format(i, names[i]))
+        else:
+            values.append(names[i])
+    if names:
+        unpack = "    {}, = v\n".format(", ".join(names))
+    else:
+        unpack = (
+            "    if len(v):\n"
+            "        raise ValueError('expected no values')\n"
+        )
+    source = "def _bind(v):\n{}    return ({})\n".format(
+        unpack, "".join(value + ", " for value in values)
+    )
+    exec(compile(source, "<bound>", "exec"), namespace)
+    return namespace["_bind"]
+
+
+class CompiledBindMixin:
+    """
+    Mixin for :class:`Cursor` implementations providing
+    :meth:`Cursor.compile` by generating a binder function from the
+    parameter types passed to :meth:`Cursor.setinputsizes`.
+
+    ``
+    cur.setinputsizes([int, str])
+    insert = cur.compile("INSERT INTO t VALUES (?, ?)")
+    values = insert(("1", "a"))  # (1, 'a')
+    ``
+
+    Only classes in param_types, which are called with the value alone,
+    convert values. Driver Type Objects such as psycopg2's STRING and
+    integer sizes leave the value unchanged.
+    """
+
+    _input_sizes = None
+
+    def setinputsizes(self, sizes: Sequence) -> None:
+        self._input_sizes = tuple(sizes)
+
+    def compile(
+            self, operation: str, param_types: Optional[Sequence] = None
+    ) -> BoundStatement:
+        if param_types is None:
+            param_types = self._input_sizes
+        if param_types is None:
+            raise ValueError(
+                "No parameter types, pass param_types or call setinputsizes"
+            )
+        return BoundStatement(operation, _make_binder(param_types))
+
+
+# array.array type codes usable for typed column buffers, with the name of
+# the matching pyarrow type.
+_ARROW_TYPES = {
+    'b': 'int8', 'B': 'uint8', 'h': 'int16', 'H': 'uint16',
+    'i': 'int32', 'I': 'uint32', 'q': 'int64', 'Q': 'uint64',
+    'f': 'float32', 'd': 'float64',
+}
+
+
+class ColumnarFetchMixin:
+    """
+    Mixin for :class:`Cursor` implementations providing
+    :meth:`Cursor.fetch_arrow` on top of :meth:`_fetch_raw`, which writes
+    values straight into per-column buffers instead of building a tuple per
+    row. Requires pyarrow.
+
+    Columns for which :meth:`_column_typecode` returns an ``array.array``
+    type code get a typed buffer which is handed to pyarrow without copying
+    or creating Python objects; other columns use a list.
+    """
+
+    #: Number of rows requested per :meth:`_fetch_raw` call when fetching
+    #: all remaining rows.
+    fetch_arrow_chunk_size = 10000
+
+    def _column_typecode(self, column: Sequence) -> Optional[str]:
+        """
+        Return the ``array.array`` type code to buffer a result column in,
+        or None to buffer it in a list. Typed buffers cannot hold NULLs.
+
+        The default uses 'q' for int and 'd' for float columns declared as
+        not nullable (null_ok is False). Drivers with their own type codes
+        should override this.
+
+        :param column: The column's entry in :attr:`description`.
+        :return: Type code or None.
+        """
+        if len(column) < 7 or column[6] is not False:
+            return None
+        return {int: 'q', float: 'd'}.get(column[1])
+
+    def _fetch_raw(self, size: int, columns: Sequence) -> int:
+        """
+        Fetch up to size rows, storing the value of column ``c`` of the
+        ``r``-th row in ``columns[c][r]``. Each buffer is a list or an
+        ``array.array`` preallocated with size entries. Must be implemented
+        by the cursor.
+
+        :param size: Maximum number of rows to fetch.
+        :param columns: One buffer per result column.
+        :return: Number of rows fetched, 0 when no more are available.
+        """
+        raise NotImplementedError(
+            "The cursor does not implement _fetch_raw!"
+        )
+
+    def fetch_arrow(self, size: Optional[int] = None):
+        import pyarrow
+
+        if self.description is None:
+            raise RuntimeError(
+                "fetch_arrow called without a pending result set"
+            )
+        names = [column[0] for column in self.description]
+        typecodes = [
+            self._column_typecode(column) for column in self.description
+        ]
+        chunk_size = size if size is not None else self.fetch_arrow_chunk_size
+        # Typed columns have a fixed arrow type. List columns take theirs
+        # from the first chunk with a non-null value, so that every chunk of
+        # a column shares one type.
+        types = [
+            getattr(pyarrow, _ARROW_TYPES[code])() if code else None
+            for code in typecodes
+        ]
+        chunks = [[] for _ in names]
+        while True:
+            columns = [
+                array.array(code, bytes(
+                    chunk_size * array.array(code).itemsize
+                )) if code else [None] * chunk_size
+                for code in typecodes
+            ]
+            count = self._fetch_raw(chunk_size, columns)
+            if count or not chunks[0]:
+                for i, column in enumerate(columns):
+                    if typecodes[i]:
+                        values = pyarrow.Array.from_buffers(
+                            types[i], count, [None, pyarrow.py_buffer(column)]
+                        )
+                    else:
+                        values = pyarrow.array(
+                            column if count == chunk_size else column[:count],
+                            type=types[i]
+                        )
+                        if types[i] is None and values.null_count < count:
+                            types[i] = values.type
+                    chunks[i].append(values)
+            if size is not None or count < chunk_size:
+                break
+        arrays = []
+        for column_type, column_chunks in zip(types, chunks):
+            if column_type is None:
+                column_type = pyarrow.null()
+            # Chunks fetched before the type was known are all null.
+            arrays.append(pyarrow.chunked_array(
+                [chunk.cast(column_type) if chunk.type != column_type
+                 else chunk for chunk in column_chunks],
+                type=column_type
+            ))
+        return pyarrow.Table.from_arrays(arrays, names=names)
+
+
+def to_pandas(cur: Cursor):
+    """
+    Fetch all remaining rows of cur into a ``pandas.DataFrame``, using
+    :meth:`Cursor.fetch_arrow` where the cursor supports it and
+    :meth:`Cursor.fetchall` otherwise.
+
+    :param cur: Cursor with a pending result set.
+    :return: pandas.DataFrame of rows.
+    """
+    if 'fetch_arrow' in capabilities_of(cur):
+        try:
+            return cur.fetch_arrow().to_pandas()
+        except ImportError:
+            pass
+    import pandas
+
+    return pandas.DataFrame.from_records(
+        cur.fetchall(), columns=[column[0] for column in cur.description]
+    )
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Steve Campbell
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+====
+pool
+====
+
+Connection pooling for PEP249 compliant database Connection objects.
+
+Opening a connection usually costs a TCP (and often TLS) handshake plus
+authentication; a pool pays that once per connection and hands the same
+connections out again.
+
+``
+from dbapi2abc import QueuePool
+
+pool = QueuePool(lambda: sqlite3.connect("app.db"), max_size=10)
+with pool.connection() as db:
+    db.cursor().execute("SELECT 1")
+``
+"""
+__author__ = "Steve Campbell"
+
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from typing import Callable, Iterator, Optional
+
+from .dbapi2abc import Connection, capabilities_of
+
+
+class ConnectionPool(ABC):
+    """ A ConnectionPool hands out and takes back open Connection objects. """
+
+    @abstractmethod
+    def acquire(self, timeout: Optional[float] = None) -> Connection:
+        """
+        Take a connection from the pool, opening a new one if needed.
+
+        The connection must be handed back with :meth:`release` once the
+        caller has finished with it.
+
+        :param timeout: Seconds to wait for a connection, None to wait forever.
+        :raise TimeoutError: If no connection became available in time.
+        :return: Database connection.
+        """
+        pass
+
+    @abstractmethod
+    def release(self, conn: Connection) -> None:
+        """
+        Return a connection obtained from :meth:`acquire` to the pool.
+
+        Any pending transaction is rolled back so the next user starts from
+        a clean state.
+
+        :param conn: The connection to return.
+        :raise ValueError: If conn is not checked out from this pool.
+        :return: None.
+        """
+        pass
+
+    @abstractmethod
+    def closeall(self) -> None:
+        """
+        Close all idle connections and stop handing out new ones.
+
+        Connections still checked out are closed when they are released.
+        :return: None.
+        """
+        pass
+
+    @contextmanager
+    def connection(
+            self, timeout: Optional[float] = None
+    ) -> Iterator[Connection]:
+        """
+        Context manager which acquires a connection and releases it on exit.
+
+        :param timeout: Seconds to wait for a connection, None to wait forever.
+        :return: Database connection.
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+
+class QueuePool(ConnectionPool):
+    """
+    A thread safe :class:`ConnectionPool` which keeps idle connections on a
+    LIFO queue, so the most recently used (and most likely still alive)
+    connection is handed out first.
+
+    At most max_size connections are checked out at any one time; further
+    calls to :meth:`acquire` block until one is released.
+    """
+
+    def __init__(self, factory: Callable[[], Connection],
+                 max_size: int = 10, min_size: int = 0):
+        """
+        :param factory: Callable returning a new open connection.
+        :param max_size: Maximum number of connections checked out at once.
+        :param min_size: Number of connections to open up front.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._factory = factory
+        self._idle = LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        # Checked out connections keyed on id(), so a connection can only be
+        # released once for each time it was acquired.
+        self._in_use = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(min_size):
+            self._idle.put(factory())
+
+    def acquire(self, timeout: Optional[float] = None) -> Connection:
+        if self._closed:
+            raise RuntimeError("The connection pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Timed out waiting for a pooled connection")
+        if self._closed:
+            # closeall() ran while this thread waited for a slot.
+            self._slots.release()
+            raise RuntimeError("The connection pool is closed")
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            try:
+                conn = self._factory()
+            except BaseException:
+                self._slots.release()
+                raise
+        with self._lock:
+            self._in_use[id(conn)] = conn
+        return conn
+
+    def release(self, conn: Connection) -> None:
+        with self._lock:
+            if self._in_use.pop(id(conn), None) is not conn:
+                raise ValueError(
+                    "The connection is not checked out from this pool"
+                )
+        try:
+            if self._closed:
+                self._discard(conn)
+                return
+            if 'rollback' in capabilities_of(conn):
+                try:
+                    conn.rollback()
+                except Exception:
+                    # The connection is broken, drop it rather than reuse it.
+                    self._discard(conn)
+                    return
+            # Check _closed again under the lock, as closeall() may have
+            # drained the idle connections during the rollback.
+            with self._lock:
+                if not self._closed:
+                    self._idle.put(conn)
+                    return
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def closeall(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = []
+            while True:
+                try:
+                    idle.append(self._idle.get_nowait())
+                except Empty:
+                    break
+        for conn in idle:
+            self._discard(conn)
+
+    @staticmethod
+    def _discard(conn: Connection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -2,14 +2,24 @@
 Based on setup.py from https://github.com/pypa/sampleproject
 """
 
-from setuptools import setup
+from setuptools import Extension, setup
+import os
 import pathlib
+import sys
 
 here = pathlib.Path(__file__).parent.resolve()
 
 # Get the long description from the README file
 long_description = (here / 'README.md').read_text(encoding='utf-8')
 
+ext_modules = []
+if os.environ.get('DBAPI2ABC_BUILD_EXT') == '1':
+    ext_modules.append(Extension(
+        'dbapi2abc._bind', ['dbapi2abc/_bind.c'],
+        extra_compile_args=[] if sys.platform == 'win32' else ['-O3'],
+        optional=True,
+    ))
+
 setup(
     # See https://packaging.python.org/specifications/core-metadata/#name
     name='dbapi2abc',  # Required
@@ -76,9 +86,14 @@ setup(
     package_dir={'dbapi2abc': 'dbapi2abc'},
     packages=['dbapi2abc'],  # Required
 
+    # Optional C speedups for dbapi2abc.binding, only built when
+    # DBAPI2ABC_BUILD_EXT=1 is set so the published wheel stays pure Python.
+    # If the extension cannot be built the pure Python implementation is used.
+    ext_modules=ext_modules,
+
     # Specify which Python versions you support. In contrast to the
     # 'Programming Language' classifiers above, 'pip install' will check this
     # and refuse to install the project if the version does not match. See
     # https://packaging.python.org/guides/distributing-packages-using-setuptools/#python-requires
-    python_requires='>=3.5, <4',
+    python_requires='>=3.7, <4',
 )
@@ -0,0 +1,86 @@
+# Test using 'pytest'
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from dbapi2abc import (
+    AsyncConnection, AsyncCursor, Connection, Cursor, SyncToAsyncAdapter
+)
+
+
+class TestAsyncConnection(AsyncConnection):
+    async def close(self) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+    async def cursor(self) -> AsyncCursor:
+        pass
+
+
+class TestAsyncCursor(AsyncCursor):
+    async def close(self) -> None:
+        pass
+
+    async def execute(self, operation: str, parameters: list = ()):
+        pass
+
+    async def executemany(self, operation: str, parameters: List[list]):
+        pass
+
+    async def fetchall(self) -> Sequence[Sequence]:
+        pass
+
+    async def fetchmany(
+            self, size: Optional[int] = None
+    ) -> Sequence[Sequence]:
+        pass
+
+    async def fetchone(self) -> Optional[Sequence]:
+        pass
+
+
+def test_async_connection():
+    db = TestAsyncConnection()
+    assert isinstance(db, AsyncConnection)
+    assert not isinstance(db, Connection)
+
+
+def test_async_cursor():
+    db = TestAsyncCursor()
+    assert isinstance(db, AsyncCursor)
+    assert not isinstance(db, Cursor)
+
+
+def test_sync_to_async_adapter():
+    async def run():
+        db = await SyncToAsyncAdapter.connect(
+            lambda: sqlite3.connect(":memory:")
+        )
+        cur = await db.cursor()
+        await cur.execute("CREATE TABLE t (a INT)")
+        await cur.executemany("INSERT INTO t VALUES (?)", [[1], [2], [3]])
+        await db.commit()
+        await cur.execute("SELECT a FROM t ORDER BY a")
+        rows = [row async for row in cur]
+        await cur.close()
+        await db.close()
+        return rows
+
+    assert asyncio.run(run()) == [(1,), (2,), (3,)]
+
+
+def test_sync_to_async_adapter_shared_executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def run():
+        db = SyncToAsyncAdapter(
+            sqlite3.connect(":memory:", check_same_thread=False), executor
+        )
+        await db.close()
+
+    asyncio.run(run())
+    assert executor.submit(int, "1").result() == 1
+    executor.shutdown()
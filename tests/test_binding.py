@@ -0,0 +1,83 @@
+# Test using 'pytest'
+import datetime
+import decimal
+import enum
+
+import pytest
+
+from dbapi2abc import bind, binding
+
+try:
+    from dbapi2abc import _bind
+except ImportError:
+    _bind = None
+
+IMPLEMENTATIONS = [
+    (binding._substitute_qmark, binding._substitute_pyformat),
+    pytest.param(
+        getattr(_bind, "substitute_qmark", None),
+        getattr(_bind, "substitute_pyformat", None),
+        marks=pytest.mark.skipif(_bind is None, reason="C extension not built"),
+    ),
+]
+
+
+def test_quote():
+    assert binding.quote(None) == b"NULL"
+    assert binding.quote(True) == b"TRUE"
+    assert binding.quote(12) == b"12"
+    assert binding.quote("it's") == b"'it''s'"
+    assert binding.quote(b"\x01\xff") == b"X'01ff'"
+    assert binding.quote(datetime.date(2021, 1, 2)) == b"'2021-01-02'"
+    with pytest.raises(TypeError):
+        binding.quote(object())
+
+
+def test_quote_numbers():
+    class Evil(int):
+        def __str__(self):
+            return "1; DROP TABLE t --"
+
+        __repr__ = __str__
+
+    class Color(enum.IntEnum):
+        RED = 1
+
+    assert binding.quote(Evil(1)) == b"1"
+    assert binding.quote(Color.RED) == b"1"
+    assert binding.quote(1.5) == b"1.5"
+    assert binding.quote(decimal.Decimal("1.50")) == b"1.50"
+    for value in (float("nan"), decimal.Decimal("NaN"),
+                  decimal.Decimal("Infinity")):
+        with pytest.raises(ValueError):
+            binding.quote(value)
+
+
+@pytest.mark.parametrize("qmark, pyformat", IMPLEMENTATIONS)
+def test_substitute_qmark(qmark, pyformat):
+    sql = b"SELECT ?, '?''?', \"a?\" FROM t WHERE a = ?"
+    assert qmark(sql, (b"1", b"'x'")) == \
+        b"SELECT 1, '?''?', \"a?\" FROM t WHERE a = 'x'"
+    assert qmark(b"SELECT 'unterminated ?", ()) == b"SELECT 'unterminated ?"
+    with pytest.raises(ValueError):
+        qmark(b"SELECT ?, ?", (b"1",))
+    with pytest.raises(ValueError):
+        qmark(b"SELECT ?", (b"1", b"2"))
+
+
+@pytest.mark.parametrize("qmark, pyformat", IMPLEMENTATIONS)
+def test_substitute_pyformat(qmark, pyformat):
+    sql = b"SELECT %(a)s, %(b)s, '100%%' WHERE c = %(a)s"
+    assert pyformat(sql, {"a": b"1", "b": b"NULL"}) == \
+        b"SELECT 1, NULL, '100%' WHERE c = 1"
+    with pytest.raises(KeyError):
+        pyformat(b"SELECT %(missing)s", {})
+    with pytest.raises(ValueError):
+        pyformat(b"SELECT %s", {})
+
+
+def test_bind():
+    assert bind("SELECT ?", ["x"]) == b"SELECT 'x'"
+    assert bind("SELECT %(v)s", {"v": 1.5}, "pyformat") == b"SELECT 1.5"
+    with pytest.raises(ValueError):
+        bind("SELECT :v", {"v": 1}, "named")
@@ -1,5 +1,13 @@
 # Test using 'pytest'
-from dbapi2abc import Connection, Cursor
+import sqlite3
+
+import pytest
+
+from dbapi2abc import (
+    CachedPrepareMixin, CachingConnectionMixin, ColumnarFetchMixin,
+    CompiledBindMixin, Connection, Cursor, PreparedStatement,
+    capabilities_of, to_pandas
+)
 from typing import List, Optional, Sequence
 
 
@@ -18,15 +26,12 @@ class TestConnection(Connection):
 
 
 class TestCursor(Cursor):
+    __test__ = False
 
-    def arraysize(self) -> int:
-        pass
-
-    def description(self) -> Optional[Sequence]:
-        pass
-
-    def rowcount(self) -> Optional[int]:
-        pass
+    def __init__(self):
+        self.description = None
+        self.rowcount = -1
+        self.arraysize = 1
 
     def close(self) -> None:
         pass
@@ -34,9 +39,6 @@ class TestCursor(Cursor):
     def execute(self, operation: str, parameters: list):
         pass
 
-    def executemany(self, operation: str, parameters: List[list]):
-        pass
-
     def fetchall(self) -> Sequence[Sequence]:
         pass
 
@@ -47,11 +49,284 @@ class TestCursor(Cursor):
         pass
 
 
+class TestPreparedStatement(PreparedStatement):
+    __test__ = False
+
+    def __init__(self, sql: str):
+        self._sql = sql
+        self.executed = []
+        self.closed = False
+
+    @property
+    def sql(self) -> str:
+        return self._sql
+
+    def execute(self, parameters: list):
+        self.executed.append(parameters)
+
+    def executemany(self, parameters: List[list]):
+        self.executed.extend(parameters)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestCachedCursor(CachedPrepareMixin, TestCursor):
+    def __init__(self):
+        super().__init__()
+        self.prepared = []
+
+    def _prepare(self, operation: str) -> PreparedStatement:
+        statement = TestPreparedStatement(operation)
+        self.prepared.append(statement)
+        return statement
+
+
 def test_connection():
     db = TestConnection()
     assert isinstance(db, Connection)
+    assert db.capabilities == {'rollback'}
 
 
 def test_cursor():
     db = TestCursor()
     assert isinstance(db, Cursor)
+    assert db.arraysize == 1
+    assert db.capabilities == frozenset()
+
+
+def test_duck_typed():
+    db = sqlite3.connect(":memory:")
+    assert isinstance(db, Connection)
+    assert isinstance(db.cursor(), Cursor)
+    assert not isinstance(TestPreparedStatement("SELECT 1"), Cursor)
+    assert capabilities_of(db) == {'rollback'}
+    assert capabilities_of(db.cursor()) == {'setinputsizes', 'setoutputsize'}
+    assert capabilities_of(TestCursor()) == frozenset()
+
+
+def test_cursor_missing_attribute():
+    class BareCursor(TestCursor):
+        debug_attributes = True
+
+        def __init__(self):
+            pass
+
+        @property
+        def description(self):
+            return self.missing
+
+    with pytest.raises(AttributeError, match="must set the 'rowcount'"):
+        BareCursor().rowcount
+    with pytest.raises(AttributeError) as excinfo:
+        BareCursor().description
+    assert "must set" not in str(excinfo.value)
+
+
+def test_driver_cursor_base():
+    class DriverCursor(sqlite3.Cursor, Cursor):
+        pass
+
+    cur = DriverCursor(sqlite3.connect(":memory:"))
+    cur.execute("SELECT 1")
+    assert cur.fetchall() == [(1,)]
+
+
+def test_cached_prepare():
+    cur = TestCachedCursor()
+    assert 'prepare' in cur.capabilities
+    cur.statement_cache_size = 1
+    cur.execute("SELECT ?", [1])
+    cur.execute("SELECT ?", [2])
+    assert len(cur.prepared) == 1
+    assert cur.current_statement is cur.prepared[0]
+    assert cur.prepared[0].executed == [[1], [2]]
+    cur.execute("SELECT 1", [])
+    assert cur.prepared[0].closed
+    cur.statement_cache_size = 0
+    cur.execute("SELECT 1", [])
+    cur.execute("SELECT 1", [])
+    assert len(cur.prepared) == 4
+    assert cur.prepared[2].closed
+    assert cur.current_statement is cur.prepared[3]
+
+
+def test_cached_prepare_keeps_current_statement():
+    cur = TestCachedCursor()
+    cur.statement_cache_size = 1
+    cur.execute("SELECT a", [])
+    cur.prepare("SELECT b")
+    assert not cur.prepared[0].closed
+    cur.statement_cache_size = 0
+    assert cur.prepared[1].closed
+    assert not cur.prepared[0].closed
+    cur.execute("SELECT b", [])
+    assert cur.prepared[0].closed
+    cur.statement_cache_size = 1
+    cur.execute("SELECT c", [])
+    assert cur.prepared[2].closed
+    cur.clear_statement_cache()
+    assert cur.prepared[3].closed
+
+
+class TestBatchCursor(TestCursor):
+    executemany_page_size = 2
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def execute_batch(self, operation: str, parameters: List[list],
+                      page_size: int = 100):
+        self.batches.append(parameters)
+
+
+def test_executemany_batches():
+    cur = TestBatchCursor()
+    assert 'execute_batch' in cur.capabilities
+    cur.executemany("INSERT INTO t VALUES (?)", [[1], [2], [3]])
+    assert cur.batches == [[[1], [2]], [[3]]]
+
+
+class TestDecliningBatchCursor(TestCursor):
+    def __init__(self):
+        super().__init__()
+        self.executed = []
+
+    def execute(self, operation: str, parameters: list):
+        self.executed.append(parameters)
+
+    def execute_batch(self, operation: str, parameters: List[list],
+                      page_size: int = 100):
+        raise NotImplementedError
+
+
+def test_executemany_fallback():
+    cur = TestDecliningBatchCursor()
+    cur.executemany("INSERT INTO t VALUES (?)", [[1], [2], [3]])
+    assert cur.executed == [[1], [2], [3]]
+
+
+class TestCachingConnection(CachingConnectionMixin, TestConnection):
+    def commit(self) -> None:
+        self._end_transaction()
+
+
+def test_plan_cache_keeps_commit_abstract():
+    class NoCommit(CachingConnectionMixin, Connection):
+        def close(self) -> None:
+            pass
+
+        def cursor(self) -> Cursor:
+            pass
+
+    with pytest.raises(TypeError):
+        NoCommit()
+
+
+def test_plan_cache():
+    db = TestCachingConnection()
+    assert db.capabilities == {'rollback'}
+    assert db.get_plan("SELECT ?") is None
+    db.put_plan("SELECT ?", "plan")
+    assert db.get_plan("SELECT ?") == "plan"
+    assert db.cache_stats()["hit_rate"] == 0.5
+    db.commit()
+    assert db.get_plan("SELECT ?") == "plan"
+    db.note_operation("ALTER TABLE t ADD c INT")
+    db.commit()
+    assert db.get_plan("SELECT ?") is None
+
+
+class TestCompiledCursor(CompiledBindMixin, TestCursor):
+    pass
+
+
+def test_compile():
+    cur = TestCompiledCursor()
+    cur.setinputsizes([int, None, 10])
+    bound = cur.compile("INSERT INTO t VALUES (?, ?, ?)")
+    assert bound.sql == "INSERT INTO t VALUES (?, ?, ?)"
+    assert bound(("1", "a", "b")) == (1, "a", "b")
+    with pytest.raises(ValueError):
+        bound((1, 2))
+    assert cur.compile("SELECT 1", [])(()) == ()
+    # A driver Type Object taking other arguments is not a converter.
+    string = lambda value, cursor: value  # noqa: E731
+    assert cur.compile("SELECT ?", [string])(("a",)) == ("a",)
+
+
+class TestColumnarCursor(ColumnarFetchMixin, TestCursor):
+    fetch_arrow_chunk_size = 2
+
+    def __init__(self, rows: List[tuple]):
+        super().__init__()
+        self.description = [
+            ("a", int, None, None, None, None, False), ("b", str)
+        ]
+        self.rows = rows
+
+    def _fetch_raw(self, size: int, columns: List[list]) -> int:
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                columns[c][r] = value
+        return len(rows)
+
+
+def test_fetch_arrow():
+    pyarrow = pytest.importorskip("pyarrow")
+    cur = TestColumnarCursor([(1, "x"), (2, "y"), (3, None)])
+    table = cur.fetch_arrow(1)
+    assert table.to_pydict() == {"a": [1], "b": ["x"]}
+    table = cur.fetch_arrow()
+    assert table.to_pydict() == {"a": [2, 3], "b": ["y", None]}
+    assert table.schema.field("a").type == pyarrow.int64()
+    cur.description = None
+    with pytest.raises(RuntimeError):
+        cur.fetch_arrow()
+
+
+def test_fetch_arrow_null_first_chunk():
+    pytest.importorskip("pyarrow")
+    cur = TestColumnarCursor([(1, None), (2, None), (3, "x")])
+    table = cur.fetch_arrow()
+    assert table.to_pydict() == {"a": [1, 2, 3], "b": [None, None, "x"]}
+
+
+def test_to_pandas_arrow():
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("pandas")
+    cur = TestColumnarCursor([(1, "x"), (2, "y"), (3, "z")])
+    frame = to_pandas(cur)
+    assert frame.to_dict("list") == {"a": [1, 2, 3], "b": ["x", "y", "z"]}
+
+
+def test_to_pandas_fetchall():
+    pytest.importorskip("pandas")
+    cur = sqlite3.connect(":memory:").cursor()
+    cur.execute("SELECT 1 AS a, 'x' AS b UNION ALL SELECT 2, 'y'")
+    frame = to_pandas(cur)
+    assert frame.to_dict("list") == {"a": [1, 2], "b": ["x", "y"]}
+
+
+class TestRowsCursor(TestCursor):
+    def __init__(self, rows: List[tuple]):
+        super().__init__()
+        self.arraysize = 2
+        self.rows = rows
+        self.fetches = 0
+
+    def fetchmany(self, size: Optional[int] = None) -> Sequence[Sequence]:
+        self.fetches += 1
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+
+def test_iter_rows():
+    cur = TestRowsCursor([(1,), (2,), (3,)])
+    assert list(cur) == [(1,), (2,), (3,)]
+    assert cur.fetches == 3
+    cur = TestRowsCursor([(1,), (2,), (3,)])
+    assert list(cur.iter_rows(5)) == [(1,), (2,), (3,)]
+    assert cur.fetches == 2
@@ -0,0 +1,76 @@
+# Test using 'pytest'
+import pytest
+
+from dbapi2abc import Connection, Cursor, QueuePool
+
+
+class TestConnection(Connection):
+    __test__ = False
+
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+
+    def close(self) -> None:
+        self.closed = True
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def cursor(self) -> Cursor:
+        pass
+
+
+def test_pool_reuses_connections():
+    pool = QueuePool(TestConnection, max_size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert first.rollbacks == 2
+
+
+def test_pool_max_size():
+    pool = QueuePool(TestConnection, max_size=1)
+    conn = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(conn)
+    assert pool.acquire(timeout=0.01) is conn
+
+
+def test_pool_release_twice():
+    pool = QueuePool(TestConnection, max_size=2)
+    conn = pool.acquire()
+    pool.release(conn)
+    with pytest.raises(ValueError):
+        pool.release(conn)
+    with pytest.raises(ValueError):
+        pool.release(TestConnection())
+    assert pool.acquire() is conn
+    assert pool.acquire() is not conn
+
+
+def test_pool_closeall():
+    pool = QueuePool(TestConnection, max_size=2, min_size=1)
+    conn = pool.acquire()
+    idle = pool.acquire()
+    pool.release(idle)
+    pool.closeall()
+    assert idle.closed
+    pool.release(conn)
+    assert conn.closed
+
+
+def test_pool_closeall_during_release():
+    pool = QueuePool(TestConnection, max_size=1)
+    conn = pool.acquire()
+    # closeall() runs while the released connection is being rolled back.
+    conn.rollback = pool.closeall
+    pool.release(conn)
+    assert conn.closed
+    with pytest.raises(RuntimeError):
+        pool.acquire()